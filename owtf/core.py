@@ -6,50 +6,15 @@ This is the command-line front-end in charge of processing arguments and call th
 """
 from __future__ import print_function
 
-from copy import deepcopy
+import functools
 import logging
 import os
 import signal
 import sys
 
-from tornado.ioloop import IOLoop, PeriodicCallback
-
 from owtf import __version__
-from owtf.api.main import start_server
-from owtf.config import config_handler
-from owtf.files.main import start_file_server
-from owtf.lib import exceptions
 from owtf.lib.cli_options import parse_options, usage
-from owtf.managers.config import load_framework_config, load_general_config
-from owtf.managers.plugin import (
-    get_types_for_plugin_group,
-    load_plugins,
-    load_test_groups,
-)
-from owtf.managers.resource import load_resources_from_file
-from owtf.managers.session import _ensure_default_session
-from owtf.managers.target import load_targets
-from owtf.managers.worklist import load_works
-from owtf.models.plugin import Plugin
-from owtf.plugin.runner import show_plugin_list
-from owtf.proxy.main import start_proxy
-from owtf.settings import (
-    AUX_TEST_GROUPS,
-    DEFAULT_FRAMEWORK_CONFIG,
-    DEFAULT_GENERAL_PROFILE,
-    DEFAULT_RESOURCES_PROFILE,
-    FALLBACK_AUX_TEST_GROUPS,
-    FALLBACK_FRAMEWORK_CONFIG,
-    FALLBACK_GENERAL_PROFILE,
-    FALLBACK_NET_TEST_GROUPS,
-    FALLBACK_RESOURCES_PROFILE,
-    FALLBACK_WEB_TEST_GROUPS,
-    NET_TEST_GROUPS,
-    WEB_TEST_GROUPS,
-)
-from owtf.transactions.main import start_transaction_logger
-from owtf.utils.file import clean_temp_storage_dirs, create_temp_storage_dirs
-from owtf.utils.process import _signal_process
+from owtf.utils.file import file_stat
 from owtf.utils.signals import workers_finish, owtf_start
 
 __all__ = ["finish", "main"]
@@ -57,18 +22,11 @@ __all__ = ["finish", "main"]
 # Store parent PID for clean exit
 owtf_pid = None
 
-# Get a global DB connection instance
-from owtf.db.session import get_scoped_session
-
-db = get_scoped_session()
-
+# Global DB connection instance, created by `main` so that importing this module stays cheap
+db = None
 
-def print_banner():
-    """
-    Print the application banner.
-    """
-    print(
-        """\033[92m
+# Application banner, built once at import time
+BANNER = """\033[92m
          _____ _ _ _ _____ _____
         |     | | | |_   _|   __|
         |  |  | | | | | | |   __|
@@ -77,10 +35,73 @@ def print_banner():
             @owtfp
         http://owtf.org
         Version: {0}
-        \033[0m""".format(
-            __version__
-        )
-    )
+        \033[0m
+""".format(__version__)
+
+# Plugin registry lookups already made in this process, keyed by lookup name and arguments
+_LOOKUP_CACHE = {}
+
+# Config files already loaded in this process, keyed by loader, non-session arguments and file modification times
+_CONFIG_CACHE = {}
+
+# Root dirs for which the DB has been fully bootstrapped in this process
+_BOOTSTRAPPED = set()
+
+# Options after which OWTF exits without running any plugin
+EARLY_EXIT_OPTIONS = ("-h", "--help", "-l", "--list-plugins")
+HELP_OPTIONS = ("-h", "--help")
+
+
+def print_banner():
+    """
+    Print the application banner.
+    """
+    sys.stdout.write(BANNER)
+
+
+def _memoize(lookup):
+    """Cache the results of a plugin registry lookup for the lifetime of the process.
+
+    .. note::
+        The plugin tables are not modified while the options are processed, so each lookup hits the DB only once.
+    """
+
+    @functools.wraps(lookup)
+    def wrapper(*args):
+        key = (lookup.__name__,) + args
+        if key not in _LOOKUP_CACHE:
+            _LOOKUP_CACHE[key] = lookup(*args)
+        return _LOOKUP_CACHE[key]
+
+    return wrapper
+
+
+@_memoize
+def _valid_groups():
+    from owtf.models.plugin import Plugin
+
+    return tuple(Plugin.get_all_plugin_groups(db))
+
+
+@_memoize
+def _valid_types():
+    from owtf.models.plugin import Plugin
+
+    return tuple(Plugin.get_all_plugin_types(db))
+
+
+@_memoize
+def _groups_for_plugins(plugins):
+    from owtf.models.plugin import Plugin
+
+    return tuple(Plugin.get_groups_for_plugins(db, list(plugins)))
+
+
+@_memoize
+def _types_for_plugin_group(plugin_group):
+    from owtf.managers.plugin import get_types_for_plugin_group
+
+    return tuple(get_types_for_plugin_group(db, plugin_group))
 
 
 def get_plugins_from_arg(arg):
@@ -92,16 +113,69 @@ def get_plugins_from_arg(arg):
     :rtype: `list`
     """
     plugins = arg.split(",")
-    plugin_groups = Plugin.get_groups_for_plugins(db, plugins)
+    plugin_groups = list(_groups_for_plugins(tuple(plugins)))
     if len(plugin_groups) > 1:
-        usage(
-            "The plugins specified belong to several plugin groups: '%s'".format(
-                str(plugin_groups)
-            )
-        )
+        usage("The plugins specified belong to several plugin groups: '{}'".format(plugin_groups))
     return [plugins, plugin_groups]
 
 
+def _file_mtime(path):
+    """Get the modification time of a file, None if it cannot be stat'ed
+
+    :param path: Path to the file
+    :type path: `str`
+    :return: Modification time
+    :rtype: `float`
+    """
+    config_stat = file_stat(path)
+    return config_stat.st_mtime if config_stat is not None else None
+
+
+def _cached_load(loader, config_files, *args, **kwargs):
+    """Call a config loader unless it already loaded the same unchanged config files in this process
+
+    :param loader: Function loading config files into the framework
+    :type loader: `function`
+    :param config_files: Paths of the config files read by the loader (default and fallback)
+    :type config_files: `tuple`
+    :param args: Arguments for the loader
+    :type args: `tuple`
+    :param session: DB session passed first to the loader, left out of the cache key
+    :type session: `Session`
+    :return: What the loader returns
+    :rtype: `object`
+    """
+    session = kwargs.pop("session", None)
+    key = (loader, args, tuple(_file_mtime(config_file) for config_file in config_files))
+    if key not in _CONFIG_CACHE:
+        _CONFIG_CACHE[key] = loader(session, *args) if session is not None else loader(*args)
+    return _CONFIG_CACHE[key]
+
+
+def _reset_bootstrap():
+    """Forget previous bootstraps so that the next `main` call loads everything again (used by tests)
+
+    :return: None
+    :rtype: None
+    """
+    _BOOTSTRAPPED.clear()
+    _CONFIG_CACHE.clear()
+    _LOOKUP_CACHE.clear()
+
+
+def _early_exit_requested(user_args, options=EARLY_EXIT_OPTIONS):
+    """Check if the user only asked for the help message or the plugin list
+
+    :param user_args: User supplied arguments
+    :type user_args: `list`
+    :param options: Options to look for
+    :type options: `tuple`
+    :return: True if one of the options was supplied
+    :rtype: `bool`
+    """
+    return any(user_arg.split("=", 1)[0] in options for user_arg in user_args)
+
+
 def process_options(user_args):
     """ The main argument processing function
 
@@ -112,8 +186,12 @@ def process_options(user_args):
     """
     arg = None
     try:
-        valid_groups = Plugin.get_all_plugin_groups(db)
-        valid_types = Plugin.get_all_plugin_types(db) + ["all", "quiet"]
+        valid_groups = list(_valid_groups())
+        if _early_exit_requested(user_args) and not _early_exit_requested(user_args, HELP_OPTIONS):
+            # Only listing the plugins, no need to query the plugin types to validate them
+            valid_types = []
+        else:
+            valid_types = list(_valid_types()) + ["all", "quiet"]
         arg = parse_options(user_args, valid_groups, valid_types)
     except KeyboardInterrupt as e:
         usage("Invalid OWTF option(s) {}".format(e))
@@ -142,88 +220,29 @@ def process_options(user_args):
             arg.except_plugins, plugin_groups = get_plugins_from_arg(arg.except_plugins)
 
         if arg.tor_mode:
-            arg.tor_mode = arg.tor_mode.split(":")
             if arg.tor_mode[0] == "help":
                 from owtf.proxy.tor_manager import TOR_manager
 
                 TOR_manager.msg_configure_tor()
                 exit(0)
-            if len(arg.tor_mode) == 1:
-                if arg.tor_mode[0] != "help":
-                    usage("Invalid argument for TOR-mode")
-            elif len(arg.tor_mode) != 5:
-                usage("Invalid argument for TOR-mode")
-            else:
-                # Enables outbound_proxy.
-                if arg.tor_mode[0] == "":
-                    outbound_proxy_ip = "127.0.0.1"
-                else:
-                    outbound_proxy_ip = arg.tor_mode[0]
-                if arg.tor_mode[1] == "":
-                    outbound_proxy_port = "9050"  # default TOR port
-                else:
-                    outbound_proxy_port = arg.tor_mode[1]
-                arg.outbound_proxy = "socks://{0}:{1}".format(
-                    outbound_proxy_ip, outbound_proxy_port
-                )
-
-        if arg.outbound_proxy:
-            arg.outbound_proxy = arg.outbound_proxy.split("://")
-            if len(arg.outbound_proxy) == 2:
-                arg.outbound_proxy = arg.outbound_proxy + arg.outbound_proxy.pop().split(
-                    ":"
-                )
-                if arg.outbound_proxy[0] not in ["socks", "http"]:
-                    usage("Invalid argument for outbound proxy")
-            else:
-                arg.outbound_proxy = arg.outbound_proxy.pop().split(":")
-            # outbound_proxy should be type://ip:port
-            if len(arg.outbound_proxy) not in [2, 3]:
-                usage("Invalid argument for outbound proxy")
-            else:  # Check if the port is an int.
-                try:
-                    int(arg.outbound_proxy[-1])
-                except ValueError:
-                    usage("Invalid port provided for Outbound Proxy")
-
-        if arg.inbound_proxy:
-            arg.inbound_proxy = arg.inbound_proxy.split(":")
-            # inbound_proxy should be (ip:)port:
-            if len(arg.inbound_proxy) not in [1, 2]:
-                usage("Invalid argument for Inbound Proxy")
-            else:
-                try:
-                    int(arg.inbound_proxy[-1])
-                except ValueError:
-                    usage("Invalid port for Inbound Proxy")
-
-        plugin_types_for_group = get_types_for_plugin_group(db, plugin_group)
+            # Enables outbound_proxy, defaulting to the local TOR port.
+            arg.outbound_proxy = ["socks", arg.tor_mode[0] or "127.0.0.1", arg.tor_mode[1] or "9050"]
+
+        plugin_types_for_group = list(_types_for_plugin_group(plugin_group))
         if arg.plugin_type == "all":
             arg.plugin_type = plugin_types_for_group
         elif arg.plugin_type == "quiet":
             arg.plugin_type = ["passive", "semi_passive"]
 
-        scope = arg.targets or []  # Arguments at the end are the URL target(s)
-        num_targets = len(scope)
-        if plugin_group != "auxiliary" and num_targets == 0 and not arg.list_plugins:
+        # Arguments at the end are the URL target(s), scope files are already expanded by the parser
+        scope = [target for targets in arg.targets or [] for target in targets]
+        if plugin_group != "auxiliary" and not scope and not arg.list_plugins:
             if arg.nowebui:
                 finish()
-        elif num_targets == 1:  # Check if this is a file
-            if os.path.isfile(scope[0]):
-                logging.info("Scope file: trying to load targets from it ..")
-                new_scope = []
-                for target in open(scope[0]).read().split("\n"):
-                    clean_target = target.strip()
-                    if not clean_target:
-                        continue  # Skip blank lines
-                    new_scope.append(clean_target)
-                if len(new_scope) == 0:  # Bad file
-                    usage("Please provide a scope file (1 target x line)")
-                scope = new_scope
-
-        for target in scope:
-            if target[0] == "-":
-                usage("Invalid Target: {}".format(target))
+
+        invalid_target = next((target for target in scope if target.startswith("-")), None)
+        if invalid_target:
+            usage("Invalid Target: {}".format(invalid_target))
 
         args = ""
         if plugin_group == "auxiliary":
@@ -232,24 +251,25 @@ def process_options(user_args):
             # auxiliary plugins do not have targets, they have metasploit-like parameters.
             scope = ["auxiliary"]
 
+        options = vars(arg)
         return {
-            "list_plugins": arg.list_plugins,
-            "force_overwrite": arg.force_overwrite,
-            "interactive": arg.interactive == "yes",
+            "list_plugins": options["list_plugins"],
+            "force_overwrite": options["force_overwrite"],
+            "interactive": options["interactive"] == "yes",
             "scope": scope,
-            "argv": sys.argv,
-            "plugin_type": arg.plugin_type,
-            "only_plugins": arg.only_plugins,
-            "except_plugins": arg.except_plugins,
-            "inbound_proxy": arg.inbound_proxy,
-            "outbound_proxy": arg.outbound_proxy,
-            "outbound_proxy_auth": arg.outbound_proxy_auth,
+            "argv": tuple(sys.argv),
+            "plugin_type": options["plugin_type"],
+            "only_plugins": options["only_plugins"],
+            "except_plugins": options["except_plugins"],
+            "inbound_proxy": options["inbound_proxy"],
+            "outbound_proxy": options["outbound_proxy"],
+            "outbound_proxy_auth": options["outbound_proxy_auth"],
             "plugin_group": plugin_group,
-            "rport": arg.rport,
-            "port_waves": arg.port_waves,
-            "proxy_mode": arg.proxy_mode,
-            "tor_mode": arg.tor_mode,
-            "nowebui": arg.nowebui,
+            "rport": options["rport"],
+            "port_waves": options["port_waves"],
+            "proxy_mode": options["proxy_mode"],
+            "tor_mode": options["tor_mode"],
+            "nowebui": options["nowebui"],
             "args": args,
         }
     return {}
@@ -263,6 +283,12 @@ def initialise_framework(options):
     :return: True if all commands do not fail
     :rtype: `bool`
     """
+    from owtf.managers.target import load_targets
+    from owtf.managers.worklist import load_works
+    from owtf.plugin.runner import show_plugin_list
+    from owtf.proxy.main import start_proxy
+    from owtf.transactions.main import start_transaction_logger
+
     logging.info("Loading framework please wait..")
     # No processing required, just list available modules.
     if options["list_plugins"]:
@@ -276,6 +302,8 @@ def initialise_framework(options):
 
 
 def poll_workers():
+    from tornado.ioloop import IOLoop, PeriodicCallback
+
     from owtf.managers.worker import worker_manager
 
     callback = PeriodicCallback(worker_manager.manage_workers, 2000)
@@ -290,6 +318,9 @@ def init(args):
     """Start OWTF.
     :params dict args: Options from the CLI.
     """
+    from owtf.api.main import start_server
+    from owtf.files.main import start_file_server
+
     if initialise_framework(args):
         if not args["nowebui"]:
             start_server()
@@ -300,8 +331,10 @@ def init(args):
 
 @workers_finish.connect
 def finish(sender=None, **kwargs):
+    from owtf.utils.process import _signal_process
+
     if sender:
-        logging.debug("[{}]: sent the signal".format(sender))
+        logging.debug("[%s]: sent the signal", sender)
     global owtf_pid
     _signal_process(pid=owtf_pid, psignal=signal.SIGINT)
 
@@ -314,32 +347,74 @@ def main():
     """
     args = sys.argv
     print_banner()
+
+    # Deferred until now so that merely importing the CLI module does not load the whole framework
+    from owtf.config import config_handler
+    from owtf.db.session import get_scoped_session
+    from owtf.lib import exceptions
+    from owtf.managers.config import load_framework_config, load_general_config
+    from owtf.managers.plugin import load_plugins, load_test_groups
+    from owtf.managers.resource import load_resources_from_file
+    from owtf.managers.session import _ensure_default_session
+    from owtf.settings import (
+        AUX_TEST_GROUPS,
+        DEFAULT_FRAMEWORK_CONFIG,
+        DEFAULT_GENERAL_PROFILE,
+        DEFAULT_RESOURCES_PROFILE,
+        FALLBACK_AUX_TEST_GROUPS,
+        FALLBACK_FRAMEWORK_CONFIG,
+        FALLBACK_GENERAL_PROFILE,
+        FALLBACK_NET_TEST_GROUPS,
+        FALLBACK_RESOURCES_PROFILE,
+        FALLBACK_WEB_TEST_GROUPS,
+        NET_TEST_GROUPS,
+        WEB_TEST_GROUPS,
+    )
+    from owtf.utils.file import clean_temp_storage_dirs, create_temp_storage_dirs
+
     # Get tool path from script path:
     root_dir = os.path.dirname(os.path.abspath(args[0])) or "."
-    global owtf_pid
+    global db, owtf_pid
+    if db is None:
+        db = get_scoped_session()
     owtf_pid = os.getpid()
 
-    # Bootstrap the DB
+    # Bootstrap the DB, only once per process unless the root dir changes
     create_temp_storage_dirs(owtf_pid)
-    try:
-        _ensure_default_session(db)
-        load_framework_config(
-            DEFAULT_FRAMEWORK_CONFIG, FALLBACK_FRAMEWORK_CONFIG, root_dir, owtf_pid
-        )
-        load_general_config(db, DEFAULT_GENERAL_PROFILE, FALLBACK_GENERAL_PROFILE)
-        load_resources_from_file(
-            db, DEFAULT_RESOURCES_PROFILE, FALLBACK_RESOURCES_PROFILE
-        )
-        load_test_groups(db, WEB_TEST_GROUPS, FALLBACK_WEB_TEST_GROUPS, "web")
-        load_test_groups(db, NET_TEST_GROUPS, FALLBACK_NET_TEST_GROUPS, "net")
-        load_test_groups(db, AUX_TEST_GROUPS, FALLBACK_AUX_TEST_GROUPS, "aux")
-        # After loading the test groups then load the plugins, because of many-to-one relationship
-        load_plugins(db)
-    except exceptions.DatabaseNotRunningException:
-        sys.exit(-1)
+    early_exit = _early_exit_requested(args[1:])
+    if root_dir not in _BOOTSTRAPPED:
+        try:
+            _ensure_default_session(db)
+            framework_config = (DEFAULT_FRAMEWORK_CONFIG, FALLBACK_FRAMEWORK_CONFIG)
+            _cached_load(load_framework_config, framework_config, *framework_config + (root_dir, owtf_pid))
+            # Help and plugin listing only need the plugins (and their test groups) in the DB
+            if not early_exit:
+                general_config = (DEFAULT_GENERAL_PROFILE, FALLBACK_GENERAL_PROFILE)
+                _cached_load(load_general_config, general_config, *general_config, session=db)
+                resources_config = (DEFAULT_RESOURCES_PROFILE, FALLBACK_RESOURCES_PROFILE)
+                _cached_load(load_resources_from_file, resources_config, *resources_config, session=db)
+            web_test_groups = (WEB_TEST_GROUPS, FALLBACK_WEB_TEST_GROUPS)
+            _cached_load(load_test_groups, web_test_groups, *web_test_groups + ("web",), session=db)
+            net_test_groups = (NET_TEST_GROUPS, FALLBACK_NET_TEST_GROUPS)
+            _cached_load(load_test_groups, net_test_groups, *net_test_groups + ("net",), session=db)
+            aux_test_groups = (AUX_TEST_GROUPS, FALLBACK_AUX_TEST_GROUPS)
+            _cached_load(load_test_groups, aux_test_groups, *aux_test_groups + ("aux",), session=db)
+            # After loading the test groups then load the plugins, because of many-to-one relationship
+            load_plugins(db)
+            # The plugin registry may have changed, so forget the lookups made on the previous one
+            _LOOKUP_CACHE.clear()
+        except exceptions.DatabaseNotRunningException:
+            sys.exit(-1)
+        if not early_exit:
+            _BOOTSTRAPPED.add(root_dir)
 
     args = process_options(args[1:])
-    config_handler.cli_options = deepcopy(args)
+    config_handler.cli_options = dict(args)
+    # Framework components connect to `owtf_start` when imported, so load them before sending it
+    import owtf.api.main  # noqa: F401
+    import owtf.managers.target  # noqa: F401
+    import owtf.plugin.runner  # noqa: F401
+
     # Patch args by sending the OWTF start signal
     owtf_start.send(__name__, args=args)
     # Initialise Framework.
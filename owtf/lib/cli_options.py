@@ -7,8 +7,23 @@ Main CLI processing machine
 from __future__ import print_function
 
 import argparse
+import logging
+import mmap
+import re
+import stat
 import sys
 
+from owtf.utils.file import file_stat
+
+OUTBOUND_PROXY_TYPES = ("http", "socks")
+# (type://)ip:port, tokenized in one pass
+OUTBOUND_PROXY_RE = re.compile(r"^(?:([^:/]+)://)?([^:/]+):([^:/]+)$")
+
+# Scope files smaller than this are read directly, mapping them in memory would cost more than it saves
+MMAP_SCOPE_FILE_SIZE = 64 * 1024
+SCOPE_LINE_RE = re.compile(br"[^\r\n]+")
+SCOPE_FILE_ENCODING = "utf-8"
+
 
 def usage(error_message):
     """Display the usage message describing how to use owtf.
@@ -73,6 +88,126 @@ def usage(error_message):
     finish()
 
 
+def _port(value, error_message):
+    """Check that a port is an integer
+
+    :param value: Port supplied by the user
+    :type value: `str`
+    :param error_message: Error message if the port is invalid
+    :type error_message: `str`
+    :return: The port
+    :rtype: `str`
+    """
+    try:
+        int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(error_message)
+    return value
+
+
+def _outbound_proxy(value):
+    """Parse and validate a type://ip:port outbound proxy
+
+    :param value: Outbound proxy supplied by the user
+    :type value: `str`
+    :return: [type, ip, port] or [ip, port] if no type was given
+    :rtype: `list`
+    """
+    match = OUTBOUND_PROXY_RE.match(value)
+    if not match or (match.group(1) and match.group(1) not in OUTBOUND_PROXY_TYPES):
+        raise argparse.ArgumentTypeError("Invalid argument for outbound proxy")
+    outbound_proxy = [token for token in match.groups() if token]
+    _port(outbound_proxy[-1], "Invalid port provided for Outbound Proxy")
+    return outbound_proxy
+
+
+def _inbound_proxy(value):
+    """Parse and validate an (ip:)port inbound proxy
+
+    :param value: Inbound proxy supplied by the user
+    :type value: `str`
+    :return: [ip, port] or [port]
+    :rtype: `list`
+    """
+    inbound_proxy = value.split(":")
+    if len(inbound_proxy) not in [1, 2]:
+        raise argparse.ArgumentTypeError("Invalid argument for Inbound Proxy")
+    _port(inbound_proxy[-1], "Invalid port for Inbound Proxy")
+    return inbound_proxy
+
+
+def _tor_mode(value):
+    """Parse and validate the ip:port:tor_control_port:password:IP_renew_time TOR mode
+
+    :param value: TOR mode supplied by the user
+    :type value: `str`
+    :return: The TOR settings, starting with "help" if the user asked for the TOR configuration help
+    :rtype: `list`
+    """
+    tor_mode = value.split(":")
+    if tor_mode[0] == "help":
+        return tor_mode
+    if len(tor_mode) != 5:
+        raise argparse.ArgumentTypeError("Invalid argument for TOR-mode")
+    if tor_mode[1]:
+        _port(tor_mode[1], "Invalid port provided for TOR-mode")
+    return tor_mode
+
+
+def _load_scope_file(path, size):
+    """Load the targets from a scope file (1 target x line), skipping blank lines
+
+    :param path: Path to the scope file
+    :type path: `str`
+    :param size: Size of the scope file in bytes
+    :type size: `int`
+    :return: List of targets
+    :rtype: `list`
+    """
+    with open(path, "rb") as scope_file:
+        if size < MMAP_SCOPE_FILE_SIZE:
+            return _scope_targets(scope_file.read())
+        # Large scope files are scanned in place instead of being copied into one big string first
+        scope_map = mmap.mmap(scope_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return _scope_targets(scope_map)
+        finally:
+            scope_map.close()
+
+
+def _scope_targets(content):
+    """Decode the non blank lines of a scope file
+
+    :param content: Raw content of the scope file
+    :type content: `bytes` or `mmap.mmap`
+    :return: List of targets
+    :rtype: `list`
+    """
+    targets = (match.group().decode(SCOPE_FILE_ENCODING).strip() for match in SCOPE_LINE_RE.finditer(content))
+    return [target for target in targets if target]
+
+
+def _targets(value):
+    """Expand a scope file into its targets, any other value is a target by itself
+
+    :param value: Target or path to a scope file supplied by the user
+    :type value: `str`
+    :return: List of targets
+    :rtype: `list`
+    """
+    scope_stat = file_stat(value)
+    if scope_stat is None or not stat.S_ISREG(scope_stat.st_mode):
+        return [value]
+    logging.info("Scope file: trying to load targets from it ..")
+    try:
+        targets = _load_scope_file(value, scope_stat.st_size)
+    except UnicodeDecodeError:
+        raise argparse.ArgumentTypeError("Scope file is not {} encoded: {}".format(SCOPE_FILE_ENCODING, value))
+    if not targets:  # Bad file
+        raise argparse.ArgumentTypeError("Please provide a scope file (1 target x line)")
+    return targets
+
+
 def parse_options(cli_options, valid_groups, valid_types):
     """Main arguments processing for the CLI
 
@@ -80,10 +215,14 @@ def parse_options(cli_options, valid_groups, valid_types):
     :type cli_options: `dict`
     :param valid_groups: Plugin groups to chose from
     :type valid_groups: `list`
-    :param valid_types: Plugin types to chose from
+    :param valid_types: Plugin types to chose from, an empty list turns off the validation of `-t`
     :type valid_types: `list`
     :return:
     :rtype:
+
+    .. note::
+        `-t` uses ``choices=valid_types or None``, so any plugin type is accepted when `valid_types` is empty
+        (plugin listing runs skip querying the plugin types).
     """
     parser = argparse.ArgumentParser(
         prog="owtf",
@@ -134,6 +273,7 @@ def parse_options(cli_options, valid_groups, valid_types):
         "--inbound-proxy",
         dest="inbound_proxy",
         default=None,
+        type=_inbound_proxy,
         help="(ip:)port - Setup an inbound proxy for manual site analysis",
     )
     parser.add_argument(
@@ -141,6 +281,7 @@ def parse_options(cli_options, valid_groups, valid_types):
         "--outbound-proxy",
         dest="outbound_proxy",
         default=None,
+        type=_outbound_proxy,
         help="type://ip:port - Send all OWTF requests using the proxy "
         "for the given ip and port. The 'type' can be 'http'(default) "
         "or 'socks'",
@@ -157,6 +298,7 @@ def parse_options(cli_options, valid_groups, valid_types):
         "--tor",
         dest="tor_mode",
         default=None,
+        type=_tor_mode,
         help="ip:port:tor_control_port:password:IP_renew_time - "
         "Sends all OWTF requests through the TOR network. "
         "For configuration help run -T help.",
@@ -186,7 +328,7 @@ def parse_options(cli_options, valid_groups, valid_types):
         "--plugin-type",
         dest="plugin_type",
         default="all",
-        choices=valid_types,
+        choices=valid_types or None,
         help="<plugin type> - For web plugins: passive, semi_passive, "
         "quiet (passive + semi_passive), grep, active, all (default)\n"
         "NOTE: grep plugins run automatically after semi_passive and "
@@ -211,5 +353,5 @@ def parse_options(cli_options, valid_groups, valid_types):
     parser.add_argument(
         "--nowebui", dest="nowebui", default=False, action="store_true", help="Run OWTF without its Web UI."
     )
-    parser.add_argument("targets", nargs="*", help="List of targets")
+    parser.add_argument("targets", nargs="*", type=_targets, help="List of targets or scope files (1 target x line)")
     return parser.parse_args(cli_options)
@@ -138,6 +138,20 @@ def get_file_as_list(filename):
     return output
 
 
+def file_stat(path):
+    """Stat a file, without raising if it does not exist
+
+    :param path: Path to the file
+    :type path: `str`
+    :return: The stat result, None if the file cannot be stat'ed
+    :rtype: `os.stat_result`
+    """
+    try:
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+
 def create_temp_storage_dirs(owtf_pid):
     """Create a temporary directory in /tmp with pid suffix.
 
@@ -3,6 +3,10 @@ tests.functional.cli.test_scope
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 """
+import os
+import shutil
+import tempfile
+
 from tests.owtftest import OWTFCliTestCase
 
 
@@ -10,6 +14,21 @@ class OWTFCliScopeTest(OWTFCliTestCase):
 
     categories = ["cli"]
 
+    def setUp(self):
+        super(OWTFCliScopeTest, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        super(OWTFCliScopeTest, self).tearDown()
+        shutil.rmtree(self.tmp_dir)
+
+    def scope_file(self, *targets):
+        """Write a scope file with one target per line and return its path."""
+        path = os.path.join(self.tmp_dir, "scope.txt")
+        with open(path, "w") as f:
+            f.write("\n".join(targets))
+        return path
+
     def test_cli_target_is_valid_ip(self):
         """Run OWTF with a valid IP target (regression #375)."""
         self.run_owtf("-s", "%s:%s" % (self.IP, self.PORT))
@@ -135,3 +154,63 @@ class OWTFCliScopeTest(OWTFCliTestCase):
             name="MainProcess",
             msg="OWTF did not finish properly!",
         )
+
+    def test_cli_target_is_scope_file(self):
+        """Run OWTF with a scope file listing a valid http target."""
+        self.run_owtf("-s", self.scope_file("%s://%s:%s" % (self.PROTOCOL, self.DOMAIN, self.PORT), ""))
+        self.assert_is_in_logs(
+            "Scope file: trying to load targets from it",
+            name="MainProcess",
+            msg="The scope file should have been loaded!",
+        )
+        self.assert_is_in_logs(
+            "(web/", name="Worker", msg="Web plugins should have been run!"
+        )
+        self.assert_is_in_logs(
+            "All jobs have been done. Exiting.",
+            name="MainProcess",
+            msg="OWTF did not finish properly!",
+        )
+
+    def test_cli_target_are_scope_file_and_target(self):
+        """Run OWTF with a scope file listing a valid http target and a valid IP target."""
+        self.run_owtf(
+            "-s",
+            self.scope_file("%s://%s:%s" % (self.PROTOCOL, self.DOMAIN, self.PORT)),
+            "%s:%s" % (self.IP, self.PORT),
+        )
+        self.assert_is_in_logs(
+            "(web/", name="Worker", msg="Web plugins should have been run!"
+        )
+        self.assert_is_in_logs(
+            "(network/", name="Worker", msg="Net plugins should have been run!"
+        )
+        self.assert_is_in_logs(
+            "All jobs have been done. Exiting.",
+            name="MainProcess",
+            msg="OWTF did not finish properly!",
+        )
+
+    def test_cli_target_is_empty_scope_file(self):
+        """Run OWTF with an empty scope file."""
+        self.run_owtf("-s", self.scope_file("", "  "))
+        self.assert_is_not_in_logs(
+            "(web/", name="Worker", msg="No plugin should have been run!"
+        )
+        self.assert_is_not_in_logs(
+            "All jobs have been done. Exiting.",
+            name="MainProcess",
+            msg="OWTF should have refused the empty scope file!",
+        )
+
+    def test_cli_target_is_scope_file_with_invalid_target(self):
+        """Run OWTF with a scope file containing a '-' prefixed target."""
+        self.run_owtf("-s", self.scope_file("%s://%s:%s" % (self.PROTOCOL, self.DOMAIN, self.PORT), "-o"))
+        self.assert_is_not_in_logs(
+            "(web/", name="Worker", msg="No plugin should have been run!"
+        )
+        self.assert_is_not_in_logs(
+            "All jobs have been done. Exiting.",
+            name="MainProcess",
+            msg="OWTF should have refused the invalid target!",
+        )
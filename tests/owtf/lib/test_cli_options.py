@@ -0,0 +1,167 @@
+"""
+tests.owtf.lib.test_cli_options
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import unittest
+
+import six
+
+from owtf.lib.cli_options import _inbound_proxy, _outbound_proxy, _targets, _tor_mode, parse_options
+
+
+class OutboundProxyTest(unittest.TestCase):
+
+    def test_type_ip_port(self):
+        """Accept type://ip:port for the supported proxy types."""
+        self.assertEqual(_outbound_proxy("socks://127.0.0.1:9050"), ["socks", "127.0.0.1", "9050"])
+        self.assertEqual(_outbound_proxy("http://127.0.0.1:8080"), ["http", "127.0.0.1", "8080"])
+
+    def test_ip_port(self):
+        """Accept ip:port without a proxy type."""
+        self.assertEqual(_outbound_proxy("127.0.0.1:8080"), ["127.0.0.1", "8080"])
+
+    def test_bad_scheme(self):
+        """Reject proxy types other than http and socks."""
+        with six.assertRaisesRegex(self, argparse.ArgumentTypeError, "Invalid argument for outbound proxy"):
+            _outbound_proxy("ftp://127.0.0.1:21")
+
+    def test_bad_shape(self):
+        """Reject values that are not (type://)ip:port."""
+        for value in ["127.0.0.1", "http://127.0.0.1", "127.0.0.1:8080:1"]:
+            with six.assertRaisesRegex(self, argparse.ArgumentTypeError, "Invalid argument for outbound proxy"):
+                _outbound_proxy(value)
+
+    def test_bad_port(self):
+        """Reject non integer ports."""
+        with six.assertRaisesRegex(self, argparse.ArgumentTypeError, "Invalid port provided for Outbound Proxy"):
+            _outbound_proxy("http://127.0.0.1:port")
+
+
+class InboundProxyTest(unittest.TestCase):
+
+    def test_port(self):
+        """Accept a port alone."""
+        self.assertEqual(_inbound_proxy("8008"), ["8008"])
+
+    def test_ip_port(self):
+        """Accept ip:port."""
+        self.assertEqual(_inbound_proxy("127.0.0.1:8008"), ["127.0.0.1", "8008"])
+
+    def test_bad_shape(self):
+        """Reject more than ip:port."""
+        with six.assertRaisesRegex(self, argparse.ArgumentTypeError, "Invalid argument for Inbound Proxy"):
+            _inbound_proxy("127.0.0.1:8008:1")
+
+    def test_bad_port(self):
+        """Reject non integer ports."""
+        with six.assertRaisesRegex(self, argparse.ArgumentTypeError, "Invalid port for Inbound Proxy"):
+            _inbound_proxy("127.0.0.1:port")
+
+
+class TorModeTest(unittest.TestCase):
+
+    def test_help(self):
+        """Accept help, with or without trailing settings."""
+        self.assertEqual(_tor_mode("help"), ["help"])
+        self.assertEqual(_tor_mode("help:")[0], "help")
+
+    def test_five_settings(self):
+        """Accept ip:port:tor_control_port:password:IP_renew_time."""
+        self.assertEqual(
+            _tor_mode("127.0.0.1:9050:9051:password:1"), ["127.0.0.1", "9050", "9051", "password", "1"]
+        )
+
+    def test_empty_ip_and_port(self):
+        """Accept an empty ip and port, defaulted later to the local TOR proxy."""
+        self.assertEqual(_tor_mode("::9051:password:1"), ["", "", "9051", "password", "1"])
+
+    def test_bad_shape(self):
+        """Reject anything but help or five settings."""
+        for value in ["127.0.0.1", "127.0.0.1:9050:9051:password"]:
+            with six.assertRaisesRegex(self, argparse.ArgumentTypeError, "Invalid argument for TOR-mode"):
+                _tor_mode(value)
+
+    def test_bad_port(self):
+        """Reject non integer TOR ports."""
+        with six.assertRaisesRegex(self, argparse.ArgumentTypeError, "Invalid port provided for TOR-mode"):
+            _tor_mode("127.0.0.1:port:9051:password:1")
+
+
+class ParseOptionsProxyTest(unittest.TestCase):
+
+    def test_valid_proxies(self):
+        """The parsed namespace holds the validated proxy lists."""
+        arg = parse_options(
+            ["-x", "socks://127.0.0.1:9050", "-p", "8008", "-T", "::9051:password:1"], ["web"], ["all"]
+        )
+        self.assertEqual(arg.outbound_proxy, ["socks", "127.0.0.1", "9050"])
+        self.assertEqual(arg.inbound_proxy, ["8008"])
+        self.assertEqual(arg.tor_mode, ["", "", "9051", "password", "1"])
+
+    def test_invalid_proxy_exits(self):
+        """argparse rejects invalid values by exiting."""
+        for cli_options in [["-x", "ftp://127.0.0.1:21"], ["-p", "port"], ["-T", "127.0.0.1"]]:
+            with self.assertRaises(SystemExit):
+                parse_options(cli_options, ["web"], ["all"])
+
+
+class TargetsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def scope_file(self, content):
+        """Write a scope file with ``content`` and return its path."""
+        path = os.path.join(self.tmp_dir, "scope.txt")
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_plain_target(self):
+        """A target which is not a file is kept as is."""
+        self.assertEqual(_targets("http://localhost:8888"), ["http://localhost:8888"])
+
+    def test_scope_file(self):
+        """A scope file is expanded into its non blank lines."""
+        path = self.scope_file(b"http://localhost:8888\n\n  127.0.0.1:8888  \r\n")
+        self.assertEqual(_targets(path), ["http://localhost:8888", "127.0.0.1:8888"])
+
+    def test_scope_file_mixed_with_targets(self):
+        """Scope files and plain targets can be given together."""
+        path = self.scope_file(b"http://localhost:8888\n")
+        arg = parse_options([path, "127.0.0.1:8888"], ["web"], ["all"])
+        self.assertEqual(arg.targets, [["http://localhost:8888"], ["127.0.0.1:8888"]])
+
+    def test_empty_scope_file(self):
+        """An empty scope file is rejected."""
+        path = self.scope_file(b"\n  \n")
+        with six.assertRaisesRegex(self, argparse.ArgumentTypeError, "Please provide a scope file"):
+            _targets(path)
+        with self.assertRaises(SystemExit):
+            parse_options([path], ["web"], ["all"])
+
+    def test_scope_file_with_option_like_line(self):
+        """Lines starting with '-' are kept so that they are reported as invalid targets."""
+        path = self.scope_file(b"http://localhost:8888\n-o\n")
+        self.assertEqual(_targets(path), ["http://localhost:8888", "-o"])
+
+    def test_large_scope_file(self):
+        """Scope files read through mmap give the same targets."""
+        path = self.scope_file(b"".join(b"host%d.invalid\r\n\n" % i for i in range(10000)))
+        targets = _targets(path)
+        self.assertEqual(len(targets), 10000)
+        self.assertEqual(targets[-1], "host9999.invalid")
+
+    def test_non_utf8_scope_file(self):
+        """A scope file which is not UTF-8 is rejected with an explicit error."""
+        path = self.scope_file(b"caf\xe9.invalid\n")
+        with six.assertRaisesRegex(self, argparse.ArgumentTypeError, "not utf-8 encoded"):
+            _targets(path)
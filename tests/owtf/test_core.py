@@ -0,0 +1,205 @@
+"""
+tests.owtf.test_core
+~~~~~~~~~~~~~~~~~~~~
+
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import mock
+
+from owtf import core
+
+
+class CachedLoadTest(unittest.TestCase):
+
+    def setUp(self):
+        core._reset_bootstrap()
+        self.addCleanup(core._reset_bootstrap)
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.config_files = (os.path.join(self.tmp_dir, "config.yaml"), os.path.join(self.tmp_dir, "fallback.yaml"))
+        with open(self.config_files[0], "w") as f:
+            f.write("key: value\n")
+        os.utime(self.config_files[0], (1000000000, 1000000000))
+        self.loader = mock.Mock(return_value="loaded")
+
+    def test_unchanged_config_is_loaded_once(self):
+        """The loader is not called again while the config files keep their modification time."""
+        self.assertEqual(core._cached_load(self.loader, self.config_files, "/opt/owtf", session="db"), "loaded")
+        self.assertEqual(core._cached_load(self.loader, self.config_files, "/opt/owtf", session="db"), "loaded")
+        self.loader.assert_called_once_with("db", "/opt/owtf")
+
+    def test_changed_config_is_loaded_again(self):
+        """A new modification time of a config file calls the loader again."""
+        core._cached_load(self.loader, self.config_files, "/opt/owtf")
+        os.utime(self.config_files[0], (1000000100, 1000000100))
+        core._cached_load(self.loader, self.config_files, "/opt/owtf")
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_other_arguments_are_loaded_again(self):
+        """Another root dir passed to the loader calls it again."""
+        core._cached_load(self.loader, self.config_files, "/opt/owtf")
+        core._cached_load(self.loader, self.config_files, "/srv/owtf")
+        self.assertEqual(self.loader.call_args_list, [mock.call("/opt/owtf"), mock.call("/srv/owtf")])
+
+    def test_session_is_not_part_of_the_key(self):
+        """A new DB session for the same config files does not call the loader again."""
+        core._cached_load(self.loader, self.config_files, "/opt/owtf", session="db")
+        core._cached_load(self.loader, self.config_files, "/opt/owtf", session="other db")
+        self.loader.assert_called_once_with("db", "/opt/owtf")
+
+
+class MainTestCase(unittest.TestCase):
+    """Run `core.main` with the DB loaders and the framework start stubbed out."""
+
+    LOADERS = {
+        "load_framework_config": "owtf.managers.config.load_framework_config",
+        "load_general_config": "owtf.managers.config.load_general_config",
+        "load_resources_from_file": "owtf.managers.resource.load_resources_from_file",
+        "load_test_groups": "owtf.managers.plugin.load_test_groups",
+        "load_plugins": "owtf.managers.plugin.load_plugins",
+    }
+
+    def setUp(self):
+        core._reset_bootstrap()
+        self.addCleanup(core._reset_bootstrap)
+        self.loaders = {}
+        for name, target in self.LOADERS.items():
+            self.loaders[name] = self.patch(target)
+        self.patch("owtf.db.session.get_scoped_session")
+        self.patch("owtf.managers.session._ensure_default_session")
+        self.patch("owtf.utils.file.create_temp_storage_dirs")
+        self.patch("owtf.utils.file.clean_temp_storage_dirs")
+        self.patch("owtf.config.config_handler")
+        self.patch("owtf.core.process_options", return_value={})
+        self.patch("owtf.core.init", return_value=False)
+        self.patch("owtf.core.finish")
+        self.patch("owtf.core.owtf_start")
+        self.patch("owtf.core.print_banner")
+        patcher = mock.patch.object(core, "db", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Importing these for real would start the framework components
+        patcher = mock.patch.dict(
+            sys.modules,
+            {"owtf.api.main": mock.MagicMock(), "owtf.managers.target": mock.MagicMock(),
+             "owtf.plugin.runner": mock.MagicMock()},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def patch(self, target, **kwargs):
+        patcher = mock.patch(target, **kwargs)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def run_main(self, *cli_options, **kwargs):
+        """Run `core.main` as if OWTF was started from ``root_dir`` with ``cli_options``."""
+        argv = [kwargs.get("root_dir", "/opt/owtf") + "/owtf.py"] + list(cli_options)
+        with mock.patch.object(sys, "argv", argv):
+            core.main()
+
+    def reset_loaders(self):
+        for loader in self.loaders.values():
+            loader.reset_mock()
+
+
+class BootstrapTest(MainTestCase):
+
+    def test_second_main_skips_loaders(self):
+        """The DB is only bootstrapped by the first `main` call of the process."""
+        self.run_main()
+        for loader in self.loaders.values():
+            self.assertTrue(loader.called)
+        self.reset_loaders()
+        self.run_main()
+        for loader in self.loaders.values():
+            self.assertFalse(loader.called)
+
+    def test_other_root_dir_reloads(self):
+        """Starting from another root dir bootstraps the DB again."""
+        self.run_main(root_dir="/opt/owtf")
+        self.reset_loaders()
+        self.run_main(root_dir="/srv/owtf")
+        self.assertTrue(self.loaders["load_framework_config"].called)
+        self.assertTrue(self.loaders["load_plugins"].called)
+
+    def test_early_exit_does_not_mark_bootstrapped(self):
+        """Help and plugin listing runs leave the next `main` call a full bootstrap."""
+        for cli_option in ["-h", "-l"]:
+            core._reset_bootstrap()
+            self.run_main(cli_option)
+            self.assertFalse(core._BOOTSTRAPPED)
+            self.reset_loaders()
+            self.run_main()
+            self.assertTrue(self.loaders["load_general_config"].called)
+            self.assertTrue(self.loaders["load_resources_from_file"].called)
+
+    def test_list_plugins_skips_general_config_and_resources(self):
+        """Listing the plugins only loads what the plugins need."""
+        self.run_main("-l", "web")
+        self.assertFalse(self.loaders["load_general_config"].called)
+        self.assertFalse(self.loaders["load_resources_from_file"].called)
+        self.assertTrue(self.loaders["load_test_groups"].called)
+        self.assertTrue(self.loaders["load_plugins"].called)
+
+
+class LookupCacheTest(MainTestCase):
+
+    def test_repeated_lookups_query_once(self):
+        """Plugin registry lookups only hit the DB once, until the DB is bootstrapped again."""
+        with mock.patch("owtf.models.plugin.Plugin.get_all_plugin_groups", return_value=["web"]) as lookup:
+            self.assertEqual(core._valid_groups(), ("web",))
+            self.assertEqual(core._valid_groups(), ("web",))
+            self.assertEqual(lookup.call_count, 1)
+            self.run_main(root_dir="/opt/owtf")
+            self.assertEqual(core._valid_groups(), ("web",))
+            self.assertEqual(lookup.call_count, 2)
+            self.run_main(root_dir="/opt/owtf")
+            self.assertEqual(core._valid_groups(), ("web",))
+            self.assertEqual(lookup.call_count, 2)
+            self.run_main(root_dir="/srv/owtf")
+            self.assertEqual(core._valid_groups(), ("web",))
+            self.assertEqual(lookup.call_count, 3)
+
+
+
+class EarlyExitTest(unittest.TestCase):
+
+    def setUp(self):
+        core._reset_bootstrap()
+        self.addCleanup(core._reset_bootstrap)
+        for target, kwargs in [
+            ("owtf.core.finish", {}),
+            ("owtf.models.plugin.Plugin.get_all_plugin_groups", {"return_value": ["web", "net"]}),
+            ("owtf.managers.plugin.get_types_for_plugin_group", {"return_value": ["active", "passive"]}),
+        ]:
+            patcher = mock.patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch("owtf.models.plugin.Plugin.get_all_plugin_types", return_value=["active", "passive"])
+        self.get_all_plugin_types = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_option_with_value(self):
+        """Options given as --option=value are recognised."""
+        self.assertTrue(core._early_exit_requested(["--list-plugins=web"]))
+        self.assertTrue(core._early_exit_requested(["--help"], core.HELP_OPTIONS))
+        self.assertFalse(core._early_exit_requested(["--list-plugins=web"], core.HELP_OPTIONS))
+        self.assertFalse(core._early_exit_requested(["-t", "active", "http://localhost"]))
+
+    def test_list_plugins_skips_plugin_types(self):
+        """Listing the plugins does not query the plugin types."""
+        options = core.process_options(["--list-plugins=web"])
+        self.assertEqual(options["list_plugins"], "web")
+        self.assertFalse(self.get_all_plugin_types.called)
+
+    def test_help_queries_plugin_types(self):
+        """The help message still lists the plugin types to choose from."""
+        with mock.patch("sys.stdout"):
+            self.assertEqual(core.process_options(["-h"]), {})
+        self.assertTrue(self.get_all_plugin_types.called)